@@ -1,7 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app import db
-from models import Product, Quotation, QuotationItem, User
+from models import Product, Quotation, QuotationItem, QuotationRequest, User
 import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
 import cloudinary.uploader
 from flask_jwt_extended import (
     create_access_token,
@@ -173,15 +177,81 @@ def list_quotations():
         return jsonify({'error': 'No se pudieron obtener las cotizaciones', 'details': str(e)}), 500
 
 
+def _quotation_body_hash(data):
+    """Huella del contenido de una cotización: email normalizado más items ordenados."""
+    items = data.get('items') if isinstance(data.get('items'), list) else []
+    normalized_items = sorted(
+        (str(item.get('product_id')), str(item.get('quantity')))
+        for item in items if isinstance(item, dict)
+    )
+    source = 'body:' + json.dumps({
+        'customer_email': str(data['customer_email']).strip().lower(),
+        'items': normalized_items,
+    }, sort_keys=True)
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _quotation_request_hash(data, body_hash):
+    """Calcula la huella de deduplicación de un envío de cotización.
+
+    Si el cliente manda `Idempotency-Key` se usa ese valor, acotado al email del
+    cliente para que dos clientes con la misma clave no se crucen; si no, se usa
+    la huella del contenido, de modo que un doble envío del mismo formulario
+    produzca la misma huella.
+    Devuelve: (hash_hex, ttl_en_segundos)
+    """
+    idempotency_key = (request.headers.get('Idempotency-Key') or '').strip()
+    if not idempotency_key:
+        return body_hash, current_app.config['QUOTATION_DEDUP_WINDOW']
+
+    source = 'key:' + json.dumps([str(data['customer_email']).strip().lower(), idempotency_key])
+    return hashlib.sha256(source.encode('utf-8')).hexdigest(), current_app.config['QUOTATION_IDEMPOTENCY_TTL']
+
+
+def _find_quotation_request(request_hash):
+    """Busca la huella por su índice único (vigente o no)."""
+    return QuotationRequest.query.filter_by(request_hash=request_hash).first()
+
+
+def _quotation_replay(previous, body_hash, now):
+    """Respuesta para un reintento de una huella vigente, o None si no aplica.
+
+    Si la clave coincide pero el contenido no, se rechaza con 422 en lugar de
+    devolver una cotización que no corresponde a lo enviado.
+    """
+    if not previous or previous.expires_at <= now:
+        return None
+    if previous.body_hash != body_hash:
+        return jsonify({'error': 'La clave Idempotency-Key ya se usó con otra solicitud'}), 422
+
+    response = jsonify({'message': 'Cotización creada correctamente', 'quotation_id': previous.quotation_id})
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response, 201
+
+
 @api_bp.route('/quotations', methods=['POST'])
 def create_quotation():
     # --- Lógica para crear una nueva cotización ---
     data = request.get_json()
 
-    if not data or 'customer_name' not in data or 'customer_email' not in data:
+    if not isinstance(data, dict) or 'customer_name' not in data or 'customer_email' not in data:
         return jsonify({'error': 'Se requieren nombre y correo del cliente (customer_name y customer_email)'}), 400
 
+    now = datetime.utcnow()
     try:
+        # --- Deduplicación: una única búsqueda por índice antes de insertar ---
+        body_hash = _quotation_body_hash(data)
+        request_hash, ttl = _quotation_request_hash(data, body_hash)
+        previous = _find_quotation_request(request_hash)
+        replay = _quotation_replay(previous, body_hash, now)
+        if replay:
+            return replay
+
+        # Purgar huellas vencidas (incluida `previous`, si la había) para liberar
+        # su hash; solo ocurre al crear, no en la ruta de reintentos. 'fetch'
+        # saca de la sesión los objetos borrados para que su id pueda reusarse.
+        QuotationRequest.query.filter(QuotationRequest.expires_at <= now).delete(synchronize_session='fetch')
+
         new_quotation = Quotation(
             customer_name=data['customer_name'],
             customer_email=data['customer_email'],
@@ -203,8 +273,28 @@ def create_quotation():
                 )
                 db.session.add(quotation_item)
 
+        db.session.add(QuotationRequest(
+            request_hash=request_hash,
+            body_hash=body_hash,
+            quotation=new_quotation,
+            created_at=now,
+            expires_at=now + timedelta(seconds=ttl)
+        ))
         db.session.commit()
-        return jsonify({'message': 'Cotización creada correctamente'}), 201
+        return jsonify({'message': 'Cotización creada correctamente', 'quotation_id': new_quotation.id}), 201
+
+    except IntegrityError as e:
+        # Un envío concurrente con la misma huella ganó la carrera: devolver el suyo
+        # solo si sigue vigente; cualquier otra violación cae al 500 habitual.
+        db.session.rollback()
+        try:
+            replay = _quotation_replay(_find_quotation_request(request_hash), body_hash, now)
+        except Exception:
+            db.session.rollback()
+            replay = None
+        if replay:
+            return replay
+        return jsonify({'error': 'Ocurrió un error', 'details': str(e)}), 500
 
     except Exception as e:
         db.session.rollback()
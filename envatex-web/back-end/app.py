@@ -39,6 +39,11 @@ def create_app():
     # Si no se encuentra, se usa una base de datos SQLite local por defecto.
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///app.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Ventanas de deduplicación de cotizaciones (en segundos): cuánto dura un
+    # `Idempotency-Key` y durante cuánto se considera duplicado un envío con el
+    # mismo email e items cuando el cliente no manda el header.
+    app.config['QUOTATION_IDEMPOTENCY_TTL'] = int(os.getenv('QUOTATION_IDEMPOTENCY_TTL', 86400))
+    app.config['QUOTATION_DEDUP_WINDOW'] = int(os.getenv('QUOTATION_DEDUP_WINDOW', 300))
 
     # --- Inicialización de Extensiones ---
     # Se conectan las extensiones instanciadas previamente con la aplicación.
@@ -56,7 +61,7 @@ def create_app():
     # Es crucial que los modelos se importen después de inicializar db
     # y dentro del contexto de la aplicación para que SQLAlchemy los reconozca.
     with app.app_context():
-        from models import Product, Quotation, QuotationItem
+        from models import Product, Quotation, QuotationItem, QuotationRequest
     # --- Registro de Rutas (Blueprints) ---
     # Aquí es donde conectaremos nuestros archivos de rutas más adelante.
     # Por ejemplo: from routes.products import products_bp
@@ -36,6 +36,8 @@ class Quotation(db.Model):
     
     # Relación con los items de la cotización
     items = db.relationship('QuotationItem', backref='quotation', cascade="all, delete-orphan")
+    # Huellas de deduplicación que apuntan a esta cotización
+    requests = db.relationship('QuotationRequest', backref='quotation', cascade="all, delete-orphan")
     
     def to_dict(self):
         return {
@@ -72,6 +74,25 @@ class QuotationItem(db.Model):
         }
 
 
+# Registro de deduplicación de envíos de cotizaciones
+class QuotationRequest(db.Model):
+    """Huella de un POST /api/quotations ya procesado.
+
+    `request_hash` es el SHA-256 del header `Idempotency-Key` (acotado al email
+    del cliente) o, si no viene, del email más los items; `body_hash` es siempre
+    el de email más items, para rechazar una clave reutilizada con otro cuerpo.
+    Los reintentos dentro de la ventana (`expires_at`) devuelven la cotización
+    original en lugar de crear otra.
+    """
+    __tablename__ = 'quotation_requests'
+    id = db.Column(db.Integer, primary_key=True)
+    request_hash = db.Column(db.String(64), unique=True, index=True, nullable=False)
+    body_hash = db.Column(db.String(64), nullable=False)
+    quotation_id = db.Column(db.Integer, db.ForeignKey('quotations.id'), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
 # Modelo de usuario para autenticación
 class User(db.Model):
     __tablename__ = 'users'
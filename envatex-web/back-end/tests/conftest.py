@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos del back-end se importan como `app`, `models`, `api.routes`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """App con una base SQLite en memoria y el esquema recién creado."""
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    monkeypatch.setenv('AUTO_CREATE_ADMIN', 'false')
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def product(app):
+    from models import Product
+    p = Product(name='Bolsa de prueba', sku='TEST-1')
+    db.session.add(p)
+    db.session.commit()
+    return p
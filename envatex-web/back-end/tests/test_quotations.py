@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+import api.routes as routes
+from app import db
+from models import Quotation, QuotationRequest
+
+
+def _payload(product, email='cliente@example.com', quantity=1):
+    return {
+        'customer_name': 'Cliente',
+        'customer_email': email,
+        'items': [{'product_id': product.id, 'quantity': quantity}],
+    }
+
+
+def test_idempotency_key_replays_original(client, product):
+    headers = {'Idempotency-Key': 'abc-123'}
+    first = client.post('/api/quotations', json=_payload(product), headers=headers)
+    second = client.post('/api/quotations', json=_payload(product), headers=headers)
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.headers['Idempotent-Replayed'] == 'true'
+    assert second.get_json()['quotation_id'] == first.get_json()['quotation_id']
+    assert Quotation.query.count() == 1
+
+
+def test_idempotency_key_with_different_body_is_rejected(client, product):
+    headers = {'Idempotency-Key': 'abc-123'}
+    client.post('/api/quotations', json=_payload(product), headers=headers)
+    res = client.post('/api/quotations', json=_payload(product, quantity=5), headers=headers)
+
+    assert res.status_code == 422
+    assert Quotation.query.count() == 1
+
+
+def test_idempotency_key_is_scoped_by_customer(client, product):
+    headers = {'Idempotency-Key': '1'}
+    first = client.post('/api/quotations', json=_payload(product), headers=headers)
+    other = client.post('/api/quotations', json=_payload(product, email='otro@example.com'), headers=headers)
+
+    assert other.status_code == 201
+    assert 'Idempotent-Replayed' not in other.headers
+    assert other.get_json()['quotation_id'] != first.get_json()['quotation_id']
+
+
+def test_content_hash_dedups_without_header(client, product):
+    first = client.post('/api/quotations', json=_payload(product))
+    second = client.post('/api/quotations', json=_payload(product, email=' Cliente@Example.com '))
+
+    assert second.status_code == 201
+    assert second.get_json()['quotation_id'] == first.get_json()['quotation_id']
+    assert Quotation.query.count() == 1
+
+
+@pytest.mark.filterwarnings('error::sqlalchemy.exc.SAWarning')
+def test_expired_request_creates_new_quotation(app, client, product):
+    app.config['QUOTATION_DEDUP_WINDOW'] = 0
+    first = client.post('/api/quotations', json=_payload(product))
+    second = client.post('/api/quotations', json=_payload(product))
+
+    assert second.status_code == 201
+    assert 'Idempotent-Replayed' not in second.headers
+    assert second.get_json()['quotation_id'] != first.get_json()['quotation_id']
+    assert Quotation.query.count() == 2
+    assert QuotationRequest.query.count() == 1
+
+
+def test_race_loser_gets_winner_result(client, product, monkeypatch):
+    winner = client.post('/api/quotations', json=_payload(product)).get_json()['quotation_id']
+
+    # Simula que la búsqueda ocurrió antes de que el envío ganador confirmara
+    lookups = []
+    original_find = routes._find_quotation_request
+
+    def find_after_race(request_hash):
+        lookups.append(request_hash)
+        return None if len(lookups) == 1 else original_find(request_hash)
+
+    monkeypatch.setattr(routes, '_find_quotation_request', find_after_race)
+    res = client.post('/api/quotations', json=_payload(product))
+
+    assert res.status_code == 201
+    assert res.get_json()['quotation_id'] == winner
+    assert Quotation.query.count() == 1
+
+
+def test_integrity_error_does_not_replay_expired_request(client, product, monkeypatch):
+    client.post('/api/quotations', json=_payload(product))
+    previous = QuotationRequest.query.one()
+    previous.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    # Otra violación de integridad (quantity NOT NULL) con la huella vencida presente
+    payload = _payload(product)
+    payload['items'][0]['quantity'] = None
+    res = client.post('/api/quotations', json=payload)
+
+    assert res.status_code == 500
+    assert 'error' in res.get_json()
+
+
+def test_non_object_body_is_rejected(client):
+    res = client.post('/api/quotations', json='customer_name customer_email')
+
+    assert res.status_code == 400
+    assert 'error' in res.get_json()
+
+
+def test_deleting_quotation_removes_its_requests(app, client, product):
+    quotation_id = client.post('/api/quotations', json=_payload(product)).get_json()['quotation_id']
+    token = create_access_token(identity='admin', additional_claims={'role': 'admin'})
+
+    res = client.delete(f'/api/quotations/{quotation_id}', headers={'Authorization': f'Bearer {token}'})
+
+    assert res.status_code == 200
+    assert QuotationRequest.query.count() == 0
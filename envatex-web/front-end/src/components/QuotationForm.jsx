@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import axios from 'axios';
 import { Card, Button, Form, Table, Alert } from 'react-bootstrap';
 import Swal from 'sweetalert2';
@@ -8,6 +8,13 @@ function QuotationForm({ items = [], onRemoveItem, onClearCart }) {
   const [customerEmail, setCustomerEmail] = useState('');
   const [submissionStatus, setSubmissionStatus] = useState(null); // null | 'loading' | 'success' | 'error'
   const [errorMsg, setErrorMsg] = useState(null);
+  // Clave de idempotencia: se mantiene entre reintentos y se renueva tras un envío exitoso
+  const idempotencyKeyRef = useRef(null);
+
+  // Si cambia el contenido de la solicitud, es un envío nuevo y necesita otra clave
+  useEffect(() => {
+    idempotencyKeyRef.current = null;
+  }, [items, customerEmail, customerName]);
 
   const handleSubmit = async (e) => {
     e.preventDefault();
@@ -24,7 +31,15 @@ function QuotationForm({ items = [], onRemoveItem, onClearCart }) {
         customer_email: customerEmail,
         items: payloadItems,
       };
-      await axios.post(`${API_BASE}/api/quotations`, payload);
+      if (!idempotencyKeyRef.current) {
+        idempotencyKeyRef.current = window.crypto?.randomUUID
+          ? window.crypto.randomUUID()
+          : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+      }
+      await axios.post(`${API_BASE}/api/quotations`, payload, {
+        headers: { 'Idempotency-Key': idempotencyKeyRef.current },
+      });
+      idempotencyKeyRef.current = null;
       setCustomerName('');
       setCustomerEmail('');
       if (typeof onClearCart === 'function') onClearCart();